@@ -1,40 +1,145 @@
+import json
+from json.encoder import encode_basestring
+import re
 import sys
 from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel, QTextEdit, QPushButton
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QThread, pyqtSignal
 from lexer import Lexer, TokenType, Token
-from parser import Parser, ParseNode, SemanticError
+from parser import ParseNode, SemanticError
+
+# Fixed fragments of the parsed output, shared by every pair
+OBJECT_HEADER = "Object:\n"
+PAIR_HEADER = "  Pair:\n"
+KEY_PREFIX = "    Key: "
+VALUE_PREFIX = "    Value: "
+STRING_PREFIX = "STRING: "
+NUMBER_PREFIX = "NUMBER: "
+
+# Token types that form a leaf node of the tree
+VALUE_TOKENS = frozenset({TokenType.STRING, TokenType.NUMBER, TokenType.TRUE, TokenType.FALSE, TokenType.NULL})
+
+# Escapes the Lexer rejects; input containing them skips the json fast path
+UNSUPPORTED_ESCAPE_RE = re.compile(r'(?<!\\)(?:\\\\)*\\[^"\\ntr]')
+
+LITERAL_VALUES = {True: "TRUE: None\n", False: "FALSE: None\n", None: "NULL: None\n"}
+
+
+class FastPathUnsupported(Exception):
+    pass
+
+
+class NumberText(str):
+    # Numbers decoded by the json fast path, kept as written like the Lexer does
+    pass
+
+
+def reject_constant(name):
+    # NaN and Infinity are accepted by json.loads but are not JSON
+    raise FastPathUnsupported(name)
+
+
+def render_json(input_text):
+    # Parse with the C accelerated json module and render the same text as
+    # render_tree does for Parser. Returns None when the input has to go
+    # through the Lexer and Parser instead (invalid JSON or unsupported shapes).
+    if UNSUPPORTED_ESCAPE_RE.search(input_text):
+        return None
+    try:
+        # Objects become tuples of pairs, which keeps key order and duplicates
+        data = json.loads(input_text, object_pairs_hook=tuple, parse_int=NumberText,
+                          parse_float=NumberText, parse_constant=reject_constant)
+        if not isinstance(data, tuple):
+            return None
+        parts = []
+        render_json_object(data, parts)
+    except (ValueError, FastPathUnsupported, RecursionError):
+        # Nesting past the recursion limit also falls back to the Parser,
+        # which reports it as an error
+        return None
+    return "".join(parts)
+
+
+def render_json_object(pairs, parts):
+    # Renders the decoded values directly; building ParseNodes first would
+    # cost more than the formatting itself
+    parts.append(OBJECT_HEADER)
+    for key, value in pairs:
+        parts.append(PAIR_HEADER)
+        parts.append(KEY_PREFIX + STRING_PREFIX + escape_string(key) + "\n")
+        if isinstance(value, NumberText):
+            parts.append(VALUE_PREFIX + NUMBER_PREFIX + value + "\n")
+        elif isinstance(value, str):
+            parts.append(VALUE_PREFIX + STRING_PREFIX + escape_string(value) + "\n")
+        elif isinstance(value, tuple):
+            parts.append(VALUE_PREFIX + OBJECT_HEADER)
+            render_json_object(value, parts)
+        elif value is None or isinstance(value, bool):
+            parts.append(VALUE_PREFIX + LITERAL_VALUES[value])
+        else:
+            # Arrays are not supported by Parser
+            raise FastPathUnsupported(type(value).__name__)
+
+
+def escape_string(value):
+    # The Lexer keeps escape sequences as written, so re-escape decoded strings
+    return encode_basestring(value)[1:-1]
+
+
+def render_tree(node):
+    # Formatting is a separate pass over the finished tree, appending into
+    # one list that is joined once
+    parts = []
+    render_object(node, parts)
+    return "".join(parts)
+
+
+def render_object(node, parts):
+    parts.append(OBJECT_HEADER)
+    for pair_node in node.children:
+        key_node, value_node = pair_node.children
+        parts.append(PAIR_HEADER)
+        parts.append(KEY_PREFIX + key_node.node_type + ": " + str(key_node.value) + "\n")
+        if value_node.node_type == "Object":
+            parts.append(VALUE_PREFIX + OBJECT_HEADER)
+            render_object(value_node, parts)
+        else:
+            parts.append(VALUE_PREFIX + value_node.node_type + ": " + str(value_node.value) + "\n")
+
 
 class Parser:
     def __init__(self, tokens):
-        self.tokens = tokens
-        self.current_pos = 0
-        self.current_token = self.tokens[self.current_pos]
+        # Reads tokens one at a time from any iterable, such as Lexer.iter_tokens()
+        self.tokens = iter(tokens)
+        self.advance()
 
     def advance(self):
-        self.current_pos += 1
-        if self.current_pos < len(self.tokens):
-            self.current_token = self.tokens[self.current_pos]
-        else:
+        self.current_token = next(self.tokens, None)
+        if self.current_token is None:
             self.current_token = Token(TokenType.EOF)
 
     def parse(self):
         # Start parsing based on the first token type
         if self.current_token.type == TokenType.LBRACE:
-            return self.parse_object()
+            node = self.parse_object()
+            # The lexer does not check what follows the object
+            if self.current_token.type != TokenType.EOF:
+                raise SyntaxError(f"Unexpected token after the object: {self.current_token.type.name}")
+            return node
         else:
-            raise SyntaxError(f"Unexpected token type at the beginning: {self.current_token.type}")
+            raise SyntaxError(f"Unexpected token type at the beginning: {self.current_token.type.name}")
 
     def parse_object(self):
-        output = "Object:\n"
+        node = ParseNode("Object")
         self.advance()  # Skip the LBRACE
 
         # Check for empty objects
         if self.current_token.type == TokenType.RBRACE:
             self.advance()
-            return output
+            return node
 
-        while self.current_token.type != TokenType.EOF:
-            output += self.parse_pair()
+        # Running out of tokens before '}' is reported by the checks below
+        while True:
+            node.add_child(self.parse_pair())
 
             if self.current_token.type == TokenType.RBRACE:
                 self.advance()
@@ -42,45 +147,36 @@ class Parser:
             elif self.current_token.type == TokenType.COMMA:
                 self.advance()
             else:
-                raise SyntaxError(f"Expected ',' or '}}' but found {self.current_token.type}")
+                raise SyntaxError(f"Expected ',' or '}}' but found {self.current_token.type.name}")
 
-        return output
+        return node
 
     def parse_pair(self):
-        output = f"  Pair:\n"
+        pair_node = ParseNode("Pair")
         key_token = self.current_token
-
-        output += f"    Key: {key_token.type}: {key_token.value}\n"
+        if key_token.type != TokenType.STRING:
+            raise SyntaxError(f"Expected a string key but found {key_token.type.name}")
+        pair_node.add_child(ParseNode(key_token.type.name, key_token.value))
         self.advance()  # Advance after reading the key token
 
         # Check for colon (':') after key
-        # if self.current_token.type != TokenType.COLON:
-        #     raise SyntaxError(f"Expected ':' after key but found {self.current_token.type}")
-        
-        # self.advance()  # Advance after the colon to move to the value token
+        if self.current_token.type != TokenType.COLON:
+            raise SyntaxError(f"Expected ':' after key but found {self.current_token.type.name}")
+
+        self.advance()  # Advance after the colon to move to the value token
 
         # Now handle the value token
         value_token = self.current_token
 
-        if value_token.type == TokenType.STRING:
-            output += f"    Value: {value_token.type}: {value_token.value}\n"
-        elif value_token.type == TokenType.NUMBER:
-            output += f"    Value: {value_token.type}: {value_token.value}\n"
-        elif value_token.type == TokenType.TRUE:
-            output += f"    Value: {value_token.type}: {value_token.value}\n"
-        elif value_token.type == TokenType.FALSE:
-            output += f"    Value: {value_token.type}: {value_token.value}\n"
-        elif value_token.type == TokenType.NULL:
-            output += f"    Value: {value_token.type}: {value_token.value}\n"
+        if value_token.type in VALUE_TOKENS:
+            pair_node.add_child(ParseNode(value_token.type.name, value_token.value))
+            self.advance()  # Move past the value token
         elif value_token.type == TokenType.LBRACE:  # Handle nested object
-            output += f"    Value: Object:\n"
-            self.advance()  # Move to the next token (the opening brace)
-            output += self.parse_object()  # Recursively parse the nested object
+            pair_node.add_child(self.parse_object())  # Consumes the whole nested object
         else:
-            raise SyntaxError(f"Unexpected value token type: {value_token.type}")
+            raise SyntaxError(f"Unexpected value token type: {value_token.type.name}")
 
-        self.advance()  # Move past the value token (if it's not EOF)
-        return output
+        return pair_node
 
 
 class ParserApp(QWidget):
@@ -119,32 +215,90 @@ class ParserApp(QWidget):
         # Set the layout to the window
         self.setLayout(layout)
 
-    def parse_input(self):
-        input_text = self.input_text.toPlainText().strip()  # Strip any extra spaces or line breaks
-        lexer = Lexer(input_text)
-
-        try:
-            # Tokenize the input
-            tokens = lexer.tokenize()
-
-            # Now parse the tokens
-            parser = Parser(tokens)
-            parsed_output = parser.parse()
+        # Background parse state (see parse_input)
+        self.worker = None
+        self.pending_text = None
 
-            # Display the parsed output
-            self.output_text.setPlainText(parsed_output)
-
-        except SemanticError as se:
-            # Handle semantic errors (e.g., invalid key names, invalid tokens, etc.)
-            self.output_text.setPlainText(f"Semantic Error: {str(se)}")
-
-        except SyntaxError as se:
-            # Handle syntax errors (e.g., unexpected tokens, missing braces, etc.)
-            self.output_text.setPlainText(f"Syntax Error: {str(se)}")
-
-        except Exception as e:
-            # Handle any other general errors
-            self.output_text.setPlainText(f"Error: {str(e)}")
+    def parse_input(self):
+        # Parsing runs in a ParseWorker so the window stays responsive on
+        # large inputs. Only one worker runs at a time: text submitted while
+        # it is busy is kept and parsed once it finishes, and newer text
+        # replaces older pending text.
+        self.pending_text = self.input_text.toPlainText().strip()  # Strip any extra spaces or line breaks
+        # Only worker_finished clears self.worker. isRunning() turns False
+        # before the queued finished slot runs, so it cannot be the gate.
+        if self.worker is None:
+            self.start_worker()
+
+    def start_worker(self):
+        self.worker = ParseWorker(self.pending_text, self)
+        self.pending_text = None
+        self.worker.parsed.connect(self.output_text.setPlainText)
+        self.worker.finished.connect(self.worker_finished)
+        self.worker.start()
+
+    def worker_finished(self):
+        self.worker.deleteLater()
+        self.worker = None
+        if self.pending_text is not None:
+            self.start_worker()
+
+    def closeEvent(self, event):
+        # Let a running parse finish before its QThread is destroyed
+        self.pending_text = None
+        if self.worker is not None:
+            self.worker.wait()
+        super().closeEvent(event)
+
+
+class ParseWorker(QThread):
+    parsed = pyqtSignal(str)
+
+    def __init__(self, input_text, parent=None):
+        super().__init__(parent)
+        self.input_text = input_text
+
+    def run(self):
+        self.parsed.emit(parse_text(self.input_text))
+
+
+def parse_text(input_text):
+    # Valid JSON is handled by the json module; everything else goes
+    # through the Lexer and Parser so their error messages are kept
+    parsed_output = render_json(input_text)
+    if parsed_output is not None:
+        return parsed_output
+
+    lexer = Lexer(input_text)
+
+    try:
+        # Parse the tokens as the lexer produces them
+        parser = Parser(lexer.iter_tokens())
+        node = parser.parse()
+
+        # A lexer error ends the tokens early, which can still leave a
+        # complete object, e.g. when the error follows the closing brace
+        if lexer.error is not None:
+            return f"Lexical Error: {str(lexer.error)}"
+        return render_tree(node)
+
+    except SemanticError as se:
+        # Handle semantic errors (e.g., invalid key names, invalid tokens, etc.)
+        error_message = f"Semantic Error: {str(se)}"
+
+    except SyntaxError as se:
+        # Handle syntax errors (e.g., unexpected tokens, missing braces, etc.)
+        error_message = f"Syntax Error: {str(se)}"
+
+    except Exception as e:
+        # Handle any other general errors
+        error_message = f"Error: {str(e)}"
+
+    # After a lexer error the parser only sees the tokens before it and an
+    # EOF, so whatever it reported follows from the lexical error
+    if lexer.error is not None:
+        return f"Lexical Error: {str(lexer.error)}"
+    return error_message
 
 
 def main():
@@ -1,27 +1,80 @@
-class TokenType:
-    COMMA = 'COMMA'  # ','
-    COLON = 'COLON'  # ':'
-    LBRACE = 'LBRACE'  # '{'
-    RBRACE = 'RBRACE'  # '}'
-    LBRACKET = 'LBRACKET'  # '['
-    RBRACKET = 'RBRACKET'  # ']'
-    STRING = 'STRING'  # Tree leaves or node names
-    NUMBER = 'NUMBER'  # Edge lengths or numeric values
-    EOF = 'EOF'  # End of input
-    TRUE = 'TRUE'  # true
-    FALSE = 'FALSE'  # false
-    NULL = 'NULL'  # null    
+import re
+import sys
+from enum import IntEnum, auto
+
+# Integer members, so comparing token types is an int comparison instead of a
+# string comparison; use .name where the readable type is needed
+class TokenType(IntEnum):
+    COMMA = auto()  # ','
+    COLON = auto()  # ':'
+    LBRACE = auto()  # '{'
+    RBRACE = auto()  # '}'
+    LBRACKET = auto()  # '['
+    RBRACKET = auto()  # ']'
+    STRING = auto()  # Tree leaves or node names
+    NUMBER = auto()  # Edge lengths or numeric values
+    EOF = auto()  # End of input
+    TRUE = auto()  # true
+    FALSE = auto()  # false
+    NULL = auto()  # null
 
 class Token:
+    __slots__ = ('type', 'value')
+
     def __init__(self, type_, value=None):
         self.type = type_
         self.value = value
         
     def __repr__(self):
         if self.value is not None:
-            return f"<{self.type}, {self.value}>"
-        return f"<{self.type}>"
+            return f"<{self.type.name}, {self.value}>"
+        return f"<{self.type.name}>"
     
+# One named alternative per token kind. tokenize() walks the input with
+# finditer, so the C regex engine finds every token and Python only handles
+# the matches. STRING takes each run of characters up to the next quote or
+# backslash in one step, instead of trying the escape alternative at every
+# character. A string followed by ':' also matches the empty KEY group, which
+# becomes the match's lastgroup. LITERAL matches the three JSON literals
+# outright; KEYWORD only takes the other words, to report them. ERROR matches
+# any character no other alternative accepts, so there are no gaps between
+# matches. Where symbols may appear is left to the parser.
+TOKEN_RE = re.compile(r'''
+    (?P<STRING>"[^"\\]*(?:\\["\\ntr][^"\\]*)*")(?:(?=[ \t\n\r]*:)(?P<KEY>))?
+  | (?P<SYMBOL>[{}\[\],:])
+  | (?P<WS>[ \t\n\r]+)
+  | (?P<NUMBER>(?:[-+]\d*|\d+)(?:\.\d*)?(?:[eE][-+]?\d*)?)
+  | (?P<LITERAL>true|false|null)(?![A-Za-z])
+  | (?P<KEYWORD>[A-Za-z]+)
+  | (?P<ERROR>.)
+''', re.VERBOSE | re.DOTALL)
+
+# Complete number: TOKEN_RE's NUMBER alternative also matches partial forms
+# such as '-', '1e' or '1e+', which are rejected with this
+VALID_NUMBER_RE = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+# Longest valid prefix of a string literal, used to locate the error when
+# TOKEN_RE's STRING alternative does not match
+STRING_PREFIX_RE = re.compile(r'"[^"\\]*(?:\\["\\ntr][^"\\]*)*')
+
+# Token of each single-character token and literal. Tokens without a value
+# carry nothing but their type, so one shared instance of each is returned
+# instead of allocating a Token per occurrence.
+SYMBOL_TOKENS = {
+    '{': Token(TokenType.LBRACE),
+    '}': Token(TokenType.RBRACE),
+    '[': Token(TokenType.LBRACKET),
+    ']': Token(TokenType.RBRACKET),
+    ',': Token(TokenType.COMMA),
+    ':': Token(TokenType.COLON),
+}
+
+LITERAL_TOKENS = {
+    'true': Token(TokenType.TRUE),
+    'false': Token(TokenType.FALSE),
+    'null': Token(TokenType.NULL),
+}
+
 # Lexer error
 class LexerError(Exception):
     def __init__(self, position, character):
@@ -32,165 +85,87 @@ class LexerError(Exception):
 class Lexer:
     def __init__(self, input_text, output_widget=None):
         self.input_text = input_text
+        self.text_length = len(input_text)  # Cached for the bounds checks in char_at()
         self.tokens = []
-        self.current_pos = 0
-        self.current_char = input_text[0] if input_text else None
         self.output_widget = output_widget  # Store reference to the output widget
-        self.brace_count = 0  # Initialize brace_count
-        self.bracket_count = 0  # Initialize bracket_count
-    
-    def advance(self):
-        self.current_pos += 1  # Fixed: it was 'self.position', which should be 'self.current_pos'
-        if self.current_pos >= len(self.input_text):
-            self.current_char = None
-        else:
-            self.current_char = self.input_text[self.current_pos]
-
-    def skip_whitespace(self):
-        while self.current_char is not None and self.current_char.isspace():
-            self.advance()
-
-    def recognize_string(self):
-        self.advance()
-        result = ''
-        while self.current_char is not None and self.current_char != '"':
-            if self.current_char == '\\':
-                self.advance()
-                if self.current_char in ['"', '\\', 'n', 't', 'r']:
-                    result += '\\' + self.current_char
-                else:
-                    raise LexerError(self.current_pos, self.current_char)  # Fixed: 'position' to 'current_pos'
-            else:
-                result += self.current_char
-            self.advance()
-        if self.current_char != '"':
-            raise LexerError(self.current_pos, "Unclosed string literal")  # Fixed: 'position' to 'current_pos'
-        self.advance()
-        return Token(TokenType.STRING, result)
-    
-    def recognize_number(self):
-        result = ''
-        has_decimal = False
-        has_exponent = False
-        
-        # Handle optional sign
-        if self.current_char in ['-', '+']:
-            result += self.current_char
-            self.advance()
-        
-        # Handle digits before decimal or exponent
-        while self.current_char is not None and self.current_char.isdigit():
-            result += self.current_char
-            self.advance()
-
-        # Handle decimal point for floats
-        if self.current_char == '.':
-            has_decimal = True
-            result += self.current_char
-            self.advance()
-            while self.current_char is not None and self.current_char.isdigit():
-                result += self.current_char
-                self.advance()
-
-        # Handle scientific notation (e or E)
-        if self.current_char in ['e', 'E']:
-            has_exponent = True
-            result += self.current_char
-            self.advance()
-            if self.current_char in ['+', '-']:
-                result += self.current_char
-                self.advance()
-            while self.current_char is not None and self.current_char.isdigit():
-                result += self.current_char
-                self.advance()
-
-        # If the number is improperly formatted, raise error
-        if not result or (not result[0].isdigit() and result[0] not in ['-', '+']):
-            raise LexerError(self.current_pos, "Invalid number format")
-
-        if result.startswith("0") and len(result) > 1 and not has_decimal and not has_exponent:
-            raise LexerError(self.current_pos, "Leading zeros not allowed for integers")
-        
-        return Token(TokenType.NUMBER, float(result) if has_decimal or has_exponent else int(result))
-
-    def recognize_keyword(self):
-        result = ''
-        while self.current_char is not None and self.current_char.isalpha():
-            result += self.current_char
-            self.advance()
-        if result == 'true':
-            return Token(TokenType.TRUE)
-        elif result == 'false':
-            return Token(TokenType.FALSE)
-        elif result == 'null':
-            return Token(TokenType.NULL)
-        else:
-            raise LexerError(self.current_pos, f"Unexpected keyword '{result}'")
-
-    def get_next_token(self):
-        while self.current_char is not None:
-            if self.current_char.isspace():
-                self.skip_whitespace()
-                continue
-            if self.current_char == '{':
-                self.brace_count += 1  # Increment brace count
-                self.advance()
-                return Token(TokenType.LBRACE)
-            if self.current_char == '}':
-                if self.brace_count == 0:
-                    raise LexerError(self.current_pos, "Unexpected closing brace")
-                self.brace_count -= 1  # Decrement brace count
-                self.advance()
-                if self.current_char not in [None, ',', '}', ']']:
-                    raise LexerError(self.current_pos, f"Unexpected character '{self.current_char}' after '}}'")
-                return Token(TokenType.RBRACE)
-            if self.current_char == '[':
-                self.bracket_count += 1  # Increment bracket count
-                self.advance()
-                return Token(TokenType.LBRACKET)
-            if self.current_char == ']':
-                if self.bracket_count == 0:
-                    raise LexerError(self.current_pos, "Unexpected closing bracket")
-                self.bracket_count -= 1  # Decrement bracket count
-                self.advance()
-                if self.current_char not in [None, ',', '}', ']']:
-                    raise LexerError(self.current_pos, f"Unexpected character '{self.current_char}' after ']'")
-                return Token(TokenType.RBRACKET)
-            if self.current_char == ',':
-                self.advance()
-                self.skip_whitespace()
-                if self.current_char is None or self.current_char not in ['"', '{', '['] and not self.current_char.isalnum():
-                    raise LexerError(self.current_pos, "Expected a value after ','")
-                return Token(TokenType.COMMA)
-            if self.current_char == ':':
-                self.advance()
-                self.skip_whitespace()
-                if self.current_char is None or self.current_char not in ['"', '{', '['] and not self.current_char.isalnum():
-                    raise LexerError(self.current_pos, "Expected a value after ':'")
-                return Token(TokenType.COLON)
-            if self.current_char == '"':
-                return self.recognize_string()
-            if self.current_char.isdigit() or self.current_char in ['-', '+']:
-                return self.recognize_number()
-            if self.current_char.isalpha():
-                return self.recognize_keyword()
-            raise LexerError(self.current_pos, f"Invalid character '{self.current_char}'")
-        return Token(TokenType.EOF)
+        self.error = None  # LexerError that ended tokenizing early, if any
+
+    def char_at(self, pos):
+        return self.input_text[pos] if pos < self.text_length else None
+
+    def string_error(self, start):
+        # Only called when no string literal could be matched at 'start'
+        end = STRING_PREFIX_RE.match(self.input_text, start).end()
+        if end >= self.text_length:
+            raise LexerError(end, "Unclosed string literal")
+        # The prefix stopped at a backslash followed by an unsupported escape
+        raise LexerError(end + 1, self.char_at(end + 1))
+
+    def make_string(self, match):
+        # Escapes are kept as written, so the value is one slice of the input
+        # between the quotes
+        return Token(TokenType.STRING, self.input_text[match.start() + 1:match.end() - 1])
+
+    def make_key(self, match):
+        # Keys are interned: they recur across objects, and interned copies
+        # share one hash and compare by identity in the parser's seen_keys.
+        # String values are used once, so they skip the intern table.
+        return Token(TokenType.STRING, sys.intern(self.input_text[match.start() + 1:match.end() - 1]))
+
+    def make_symbol(self, match):
+        return SYMBOL_TOKENS[match.group()]
+
+    def make_number(self, match):
+        # The value stays as written; callers that need a number convert it
+        # themselves, and the source text keeps what the parser validates
+        text = match.group()
+        if VALID_NUMBER_RE.fullmatch(text) is None:
+            raise LexerError(match.end(), "Invalid number format")
+        # Only numbers starting with '0' need the int-vs-float classification
+        if text[0] == '0' and len(text) > 1 and not ('.' in text or 'e' in text or 'E' in text):
+            raise LexerError(match.end(), "Leading zeros not allowed for integers")
+        return Token(TokenType.NUMBER, text)
+
+    def make_literal(self, match):
+        return LITERAL_TOKENS[match.group()]
+
+    def make_keyword(self, match):
+        # LITERAL already took true, false and null, so any word here is an error
+        word = match.group()
+        raise LexerError(match.end(), f"Unexpected keyword '{word}'")
+
+    def make_error(self, match):
+        # A quote only ends up here when the string literal is not valid
+        char = match.group()
+        pos = match.start()
+        if char == '"':
+            self.string_error(pos)
+        raise LexerError(pos, f"Invalid character '{char}'")
 
     # Tokenize the input
     def tokenize(self):
-        tokens = []
-        while True:
-            try:
-                token = self.get_next_token()
-                if token.type == TokenType.EOF:
-                    break
-                tokens.append(token)
-            except LexerError as e:
-                self.display_error(f"Lexical Error: {e}")  # Send error to the output widget
-                break
-        tokens.append(Token(TokenType.EOF))  # Add EOF token at the end
-        return tokens
+        return list(self.iter_tokens())
+
+    # Yield tokens as they are matched, ending with EOF
+    def iter_tokens(self):
+        handlers = {
+            'STRING': self.make_string,
+            'KEY': self.make_key,
+            'SYMBOL': self.make_symbol,
+            'NUMBER': self.make_number,
+            'LITERAL': self.make_literal,
+            'KEYWORD': self.make_keyword,
+            'ERROR': self.make_error,
+        }
+        try:
+            for match in TOKEN_RE.finditer(self.input_text):
+                kind = match.lastgroup
+                if kind != 'WS':
+                    yield handlers[kind](match)
+        except LexerError as e:
+            self.error = e
+            self.display_error(f"Lexical Error: {e}")  # Send error to the output widget
+        yield Token(TokenType.EOF)  # Add EOF token at the end
 
     def display_error(self, error_message):
         if self.output_widget: